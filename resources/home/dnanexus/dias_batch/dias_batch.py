@@ -5,12 +5,17 @@ import os
 import re
 import subprocess
 
-if os.path.exists('/home/dnanexus'):
+# check for the env once, used both to install packages and import from
+# the installed package, and to only start the app when running in it
+RUNNING_IN_DNANEXUS = os.path.exists('/home/dnanexus')
+
+if RUNNING_IN_DNANEXUS:
     # running in DNAnexus
     subprocess.check_call([
         'pip', 'install', "--no-index", "--no-deps"
     ] + glob("packages/*"))
 
+    from dias_batch.utils.defaults import epic_control_pattern
     from dias_batch.utils.dx_requests import DXExecute, DXManage
     from dias_batch.utils.utils import (
         add_panels_and_indications_to_manifest,
@@ -23,6 +28,7 @@ if os.path.exists('/home/dnanexus'):
         write_summary_report
     )
 else:
+    from .utils.defaults import epic_control_pattern
     from .utils.dx_requests import DXExecute, DXManage
     from .utils.utils import (
         add_panels_and_indications_to_manifest,
@@ -73,7 +79,7 @@ class CheckInputs():
         self.check_qc_file()
 
         if self.errors:
-            errors = '; '.join(x for x in self.errors)
+            errors = '; '.join(self.errors)
             raise RuntimeError(
                 f"Errors in job inputs:\n\t{errors}"
             )
@@ -100,13 +106,15 @@ class CheckInputs():
             self.inputs.get('assay_config_file'):
                 return
 
+        # only need to know if there is at least one config file, so stop
+        # at the first one found and don't describe it
         project, path = self.inputs['assay_config_dir'].split(':')
         files = list(dxpy.find_data_objects(
             name="*.json",
             name_mode='glob',
             project=project,
             folder=path,
-            describe=True
+            limit=1
         ))
 
         if not files:
@@ -161,9 +169,9 @@ class CheckInputs():
             self.errors.append('No mode specified to run in')
 
         modes.pop(0)
-        if any([
+        if any(
             self.inputs.get(x) for x in modes
-        ]) and not self.inputs.get('manifest_files'):
+        ) and not self.inputs.get('manifest_files'):
             self.errors.append(
                 'Reports argument specified with no manifest file'
             )
@@ -241,10 +249,10 @@ class CheckInputs():
         Check when -iexclude_samples or -iexclude_samples_file is passed
         that only one is specified
         """
-        if all([
-            self.inputs.get('exclude_samples'),
+        if (
+            self.inputs.get('exclude_samples') and
             self.inputs.get('exclude_samples_file')
-        ]):
+        ):
             self.errors.append(
                 "Both -iexclude_samples and -iexclude_samples_file specified, "
                 "only one may be specified"
@@ -336,15 +344,23 @@ def main(
 
     assay_config = fill_config_reference_inputs(assay_config)
 
+    # build list of samples to exclude in a single pass, stripping any
+    # whitespace and dropping empty entries (i.e. blank lines in file)
     if exclude_samples:
-        exclude_samples = exclude_samples.split(',')
+        exclude_samples = [
+            x for x in map(str.strip, exclude_samples.split(',')) if x
+        ]
 
     if exclude_samples_file:
-        exclude_samples = DXManage().read_dxfile(exclude_samples_file)
+        exclude_samples = [
+            x for x in map(
+                str.strip, DXManage().read_dxfile(exclude_samples_file)
+            ) if x
+        ]
 
     if exclude_controls:
         # pattern to default to excluding Epic control samples
-        exclude_samples.append(r'^\w+-\w+Q\w+-')
+        exclude_samples.append(epic_control_pattern)
 
     # parse and format genepanels file
     genepanels_data = DXManage().read_dxfile(
@@ -368,12 +384,13 @@ def main(
                 subset=manifest_subset
             )
 
-            # combine manifest data to previous
-            manifest = {**manifest, **manifest_data}
-            manifest_source = {**manifest_source, **source}
+            # combine manifest data to previous, updating in place rather
+            # than copying everything parsed so far for every file
+            manifest.update(manifest_data)
+            manifest_source.update(source)
 
         print("Parsed manifest(s):")
-        print('⠀⠀', '\n⠀⠀⠀'.join({f"{k}: {v}" for k, v in manifest.items()}))
+        print('⠀⠀', '\n⠀⠀⠀'.join(f"{k}: {v}" for k, v in manifest.items()))
 
         # record what we had provided before excluding anything
         provided_manifest_samples = manifest.keys()
@@ -391,11 +408,10 @@ def main(
             genepanels=genepanels
         )
 
-        # combine manifest source for each sample into its manifest values
-        manifest = {
-            sample: {**manifest[sample], **manifest_source[sample]}
-            for sample in manifest
-        }
+        # combine manifest source for each sample into its manifest values,
+        # the manifest dicts are newly built above so update them in place
+        for sample, sample_config in manifest.items():
+            sample_config.update(manifest_source[sample])
 
     # check up front if any files for any of the selected running modes
     # are in an archived state which would cause jobs to fail to launch
@@ -494,16 +510,21 @@ def main(
         launched_jobs['mosaic_reports'] = mosaic_reports
 
     if artemis:
-        # get parent output path of all reports workflows
+        # get parent output path of all reports workflows, only requesting
+        # the folder since full analysis describes include every stage job
         snv_path = cnv_path = None
 
         if launched_jobs.get('snv_reports'):
             snv_path = dxpy.describe(
-                launched_jobs.get('snv_reports')[0])['folder']
+                launched_jobs.get('snv_reports')[0],
+                fields={'folder': True}
+            )['folder']
 
         if launched_jobs.get('cnv_reports'):
             cnv_path = dxpy.describe(
-                launched_jobs.get('cnv_reports')[0])['folder']
+                launched_jobs.get('cnv_reports')[0],
+                fields={'folder': True}
+            )['folder']
 
         dependent_jobs = [
             job for job_list in launched_jobs.values() for job in job_list
@@ -540,13 +561,16 @@ def main(
         print("Terminating launched jobs...")
         DXExecute().terminate(list(chain(*launched_jobs.values())))
 
-    project_name = dxpy.describe(os.environ.get('DX_PROJECT_CONTEXT_ID'))['name']
+    # project is already described if CNV calling was run, use cached call
+    project_name = DXManage().describe_object(
+        os.environ.get('DX_PROJECT_CONTEXT_ID'))['name']
     summary_file = f"{project_name}_{start_time}_job_summary.txt"
 
     job_details = dxpy.DXJob(dxid=os.environ.get('DX_JOB_ID')).describe()
-    app_details = dxpy.describe(job_details['executable'])
+    app_details = DXManage().describe_object(job_details['executable'])
 
-    # overwrite manifest job ID in job details with name to write to summary
+    # overwrite manifest job ID in job details with name to write to
+    # summary, using the cached describe in case a file is given twice
     if manifest_files:
         manifest_names = []
         for file in job_details['runInput']['manifest_files']:
@@ -557,7 +581,7 @@ def main(
             if isinstance(file, dict):
                 file = file['id']
 
-            manifest_names.append(dxpy.describe(file)['name'])
+            manifest_names.append(DXManage().describe_object(file)['name'])
 
         job_details['runInput']['manifest_files'] = ', '.join(manifest_names)
 
@@ -579,10 +603,10 @@ def main(
         mosaic_report_summary=mosaic_report_summary
     )
 
+    # job output folder already in job details, no need to describe again
     url_file = dxpy.upload_local_file(
         summary_file,
-        folder=dxpy.bindings.dxjob.DXJob(
-            os.environ.get('DX_JOB_ID')).describe()['folder']
+        folder=job_details['folder']
     )
 
     launched_jobs = ','.join([
@@ -594,6 +618,6 @@ def main(
         "launched_jobs": launched_jobs
     }
 
-if os.path.exists('/home/dnanexus'):
+if RUNNING_IN_DNANEXUS:
     # check for env to allow importing CheckInputs for unit tests
     dxpy.run()
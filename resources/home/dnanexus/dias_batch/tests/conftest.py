@@ -0,0 +1,22 @@
+"""
+Shared fixtures for all tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(
+    os.path.join(os.path.realpath(__file__), '../../')
+))
+
+from utils.dx_requests import DXManage
+
+
+@pytest.fixture(autouse=True)
+def clear_describe_cache():
+    """
+    Clear the cache of DXManage.describe_object() before each test so
+    that describe output patched in one test isn't returned in another
+    """
+    DXManage.describe_object.cache_clear()
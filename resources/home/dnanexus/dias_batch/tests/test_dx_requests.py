@@ -23,6 +23,48 @@ from utils import utils
 from utils.dx_requests import DXExecute, DXManage
 
 
+class TestDXManageDescribeObject():
+    """
+    Tests for DXManage.describe_object()
+
+    Function is a cached wrapper of dxpy.describe() to stop the same
+    object being described more than once per run
+    """
+
+    @patch('utils.dx_requests.dxpy.describe')
+    def test_same_id_only_described_once(self, mock_describe):
+        """
+        Test that calling multiple times with the same ID only results
+        in one dxpy.describe() call and the same output is returned
+        """
+        mock_describe.return_value = {'name': 'workflow1'}
+
+        first = DXManage().describe_object('workflow-xxx')
+        second = DXManage().describe_object('workflow-xxx')
+
+        assert mock_describe.call_count == 1, (
+            "dxpy.describe() called more than once for the same ID"
+        )
+
+        assert first == second == {'name': 'workflow1'}, (
+            "Incorrect describe output returned"
+        )
+
+    @patch('utils.dx_requests.dxpy.describe')
+    def test_different_ids_described_separately(self, mock_describe):
+        """
+        Test that each different ID results in a dxpy.describe() call
+        """
+        mock_describe.side_effect = [{'name': 'applet1'}, {'name': 'applet2'}]
+
+        DXManage().describe_object('applet-xxx')
+        DXManage().describe_object('applet-yyy')
+
+        assert mock_describe.call_count == 2, (
+            "dxpy.describe() not called for each different ID"
+        )
+
+
 class TestDXManageReadAssayConfigFile():
     """
     Tests for DXManage.read_assay_config_file()
@@ -31,9 +73,9 @@ class TestDXManageReadAssayConfigFile():
     reads this into a dict object
     """
 
-    @patch('utils.dx_requests.dxpy.DXFile')
+    @patch('utils.dx_requests.dxpy.describe')
     @patch('utils.dx_requests.DXManage.read_dxfile')
-    def test_config_correctly_read(self, mock_read, mock_file):
+    def test_config_correctly_read(self, mock_read, mock_describe):
         """
         Test config file is correctly read in, function uses already tested
         DXManage.read_dxfile() to read the contents into a list, so this will
@@ -41,7 +83,7 @@ class TestDXManageReadAssayConfigFile():
         is added under the key 'name'
         """
         # minimal describe call return from config file
-        mock_file.return_value.describe.return_value = {
+        mock_describe.return_value = {
             'id': 'file-xxx',
             'name': 'testAssayConfig.json'
         }
@@ -341,28 +383,44 @@ class TestDXManageGetFileProjectContext():
     Function takes a DXFile ID and returns a project ID in which
     the file has been found in a live state
     """
-    @patch('utils.dx_requests.dxpy.DXFile.list_projects')
-    @patch('utils.dx_requests.dxpy.DXFile.describe')
+    @staticmethod
+    def mock_dxfile(projects, file_details):
+        """
+        Build side effect for patching dxpy.DXFile, files are described
+        concurrently so we need to return the details for the project the
+        DXFile object was created for instead of relying on call order
+
+        Parameters
+        ----------
+        projects : dict
+            return of DXFile.list_projects()
+        file_details : list
+            describe output of the file in each project
+        """
+        details = {x['project']: x for x in file_details}
+
+        def dxfile(dxid, project=None):
+            handler = mock.MagicMock()
+            handler.list_projects.return_value = projects
+            handler.describe.return_value = details.get(project)
+
+            return handler
+
+        return dxfile
+
     @patch('utils.dx_requests.dxpy.DXFile')
-    def test_no_live_files(
-            self,
-            mock_file,
-            mock_describe,
-            mock_list
-        ):
+    def test_no_live_files(self, mock_file):
         """
         Test that when no files in a live state are found that an
         AssertionError is raised
         """
-        # patch the DXFile object that read() gets called on
-        mock_file.return_value = dxpy.DXFile
-        mock_list.return_value = {
+        projects = {
             'project-xxx': 'CONTRIBUTE',
             'project-yyy': 'CONTRIBUTE'
         }
 
         # mock describing each project:file context found
-        mock_describe.side_effect = [
+        file_details = [
             {
                 'project': 'project-xxx',
                 'id': 'file-xxx',
@@ -376,34 +434,26 @@ class TestDXManageGetFileProjectContext():
             }
         ]
 
+        mock_file.side_effect = self.mock_dxfile(projects, file_details)
+
         correct_error = 'No live files could be found for the ID: file-xxx'
 
         with pytest.raises(AssertionError, match=correct_error):
             DXManage().get_file_project_context(file='file-xxx')
 
-    @patch('utils.dx_requests.dxpy.DXFile.list_projects')
-    @patch('utils.dx_requests.dxpy.DXFile.describe')
     @patch('utils.dx_requests.dxpy.DXFile')
-    def test_live_files(
-        self,
-        mock_file,
-        mock_describe,
-        mock_list,
-        capsys
-    ):
+    def test_live_files(self, mock_file, capsys):
         """
         Test when some live files are found, we correctly return the
         first one to use as the project context
         """
-        # patch the DXFile object that read() gets called on
-        mock_file.return_value = dxpy.DXFile
-        mock_list.return_value = {
+        projects = {
             'project-xxx': 'CONTRIBUTE',
             'project-yyy': 'CONTRIBUTE'
         }
 
         # mock describing each project:file context found
-        mock_describe.side_effect = [
+        file_details = [
             {
                 'project': 'project-xxx',
                 'id': 'file-xxx',
@@ -417,6 +467,8 @@ class TestDXManageGetFileProjectContext():
             }
         ]
 
+        mock_file.side_effect = self.mock_dxfile(projects, file_details)
+
         returned = DXManage().get_file_project_context(file='file-xxx')
 
         errors = []
@@ -546,6 +598,25 @@ class TestDXManageFindFiles():
         )
 
 
+    @patch('utils.dx_requests.dxpy.find_data_objects')
+    def test_only_required_describe_fields_requested(self, mock_find):
+        """
+        Test that we only request the describe fields we use from
+        dxpy.find_data_objects() and not the full describe of every file
+        """
+        mock_find.return_value = []
+
+        DXManage().find_files(path='project-xxx:/path_to_files/')
+
+        assert mock_find.call_args[1]['describe'] == {
+            'fields': {
+                'name': True,
+                'folder': True,
+                'archivalState': True
+            }
+        }, 'Incorrect describe fields requested'
+
+
 class TestDXManageReadDXfile():
     """
     Tests for DXManage.read_dxfile()
@@ -686,8 +757,9 @@ class TestCheckAllFilesArchivalState(unittest.TestCase):
         patterns from utils.defaults is used.
 
         We will use calls to dx_requests.find_files as a proxy for the
-        config patterns being used, as we expected 6 calls for the 4
-        running modes to be made (4x per sample and 2x per run patterns).
+        config patterns being used, as we expected 2 calls for the 4
+        running modes to be made (1x per sample and 1x per run patterns
+        combined across all modes).
         """
         DXManage().check_all_files_archival_state(
             patterns=None,
@@ -702,7 +774,7 @@ class TestCheckAllFilesArchivalState(unittest.TestCase):
             }
         )
 
-        assert mock_find.call_count == 6, (
+        assert mock_find.call_count == 2, (
             'incorrect number of calls to dx_requests.find_files'
         )
 
@@ -735,16 +807,52 @@ class TestCheckAllFilesArchivalState(unittest.TestCase):
 
             assert expected_stdout in self.capsys.readouterr().out
 
-        with self.subTest('incorrect calls made to dx_requests.find_files'):
-            assert mock_find.call_count == 4
+        with self.subTest('incorrect patterns provided to dx_requests.find_files'):
+            called_patterns = [
+                x[1]['pattern'] for x in mock_find.call_args_list
+            ]
+
+            assert not any(
+                '_segments.vcf$' in x or '_excluded_intervals.bed$' in x
+                for x in called_patterns
+            )
 
 
-    def test_correct_patterns_provided_for_each_mode(
+    def test_per_sample_search_skipped_if_no_samples(
         self, mock_archive, mock_find
     ):
         """
-        Test that for each running mode the correct patterns are provided
-        when doing the searching
+        Test that if no samples are given we don't search with an empty
+        per sample pattern (which would match every file in the path)
+        and only search for the run level files
+        """
+        DXManage().check_all_files_archival_state(
+            patterns=None,
+            samples=[],
+            path='project-xxx:/',
+            unarchive=False,
+            modes={
+                'cnv_reports': True,
+                'snv_reports': False,
+                'mosaic_reports': False,
+                'artemis': False
+            }
+        )
+
+        called_patterns = [x[1]['pattern'] for x in mock_find.call_args_list]
+
+        assert called_patterns == ['_excluded_intervals.bed$'], (
+            'per sample files searched for with no samples given'
+        )
+
+
+    def test_correct_patterns_provided_for_all_modes(
+        self, mock_archive, mock_find
+    ):
+        """
+        Test that the correct patterns for all running modes are combined
+        into a single per sample and a single per run search, with patterns
+        shared between modes only searched for once
         """
         DXManage().check_all_files_archival_state(
             patterns=None,
@@ -760,33 +868,19 @@ class TestCheckAllFilesArchivalState(unittest.TestCase):
         )
 
         # define what patterns we expect the function to provide to
-        # each call to dx_requests.find_files for each running mode
+        # the per sample and per run calls to dx_requests.find_files
         expected_called_patterns = {
-            'cnv_reports_sample': (
-                    'sample_1.*_segments.vcf$|sample_2.*_segments.vcf$'
+            'sample': (
+                '(sample_1|sample_2).*('
+                '_segments.vcf$|'
+                '_markdup_recalibrated_Haplotyper.vcf.gz$|'
+                'per-base.bed.gz$|reference_build.txt$|'
+                '_markdup_recalibrated_tnhaplotyper2.vcf.gz|'
+                'bam$|bam.bai$|'
+                '_copy_ratios.gcnv.bed.gz$|'
+                '_copy_ratios.gcnv.bed.gz.tbi$)'
             ),
-            'cnv_reports_run': '_excluded_intervals.bed$',
-            'snv_reports': (
-                'sample_1.*_markdup_recalibrated_Haplotyper.vcf.gz$|'
-                'sample_1.*per-base.bed.gz$|sample_1.*reference_build.txt$|'
-                'sample_2.*_markdup_recalibrated_Haplotyper.vcf.gz$|'
-                'sample_2.*per-base.bed.gz$|sample_2.*reference_build.txt$'
-                ),
-            'mosaic_reports': (
-                'sample_1.*_markdup_recalibrated_tnhaplotyper2.vcf.gz|'
-                'sample_1.*per-base.bed.gz$|sample_1.*reference_build.txt$|'
-                'sample_2.*_markdup_recalibrated_tnhaplotyper2.vcf.gz|'
-                'sample_2.*per-base.bed.gz$|sample_2.*reference_build.txt$'
-            ),
-            'artemis_sample': (
-                'sample_1.*bam$|sample_1.*bam.bai$|'
-                'sample_1.*_copy_ratios.gcnv.bed.gz$|'
-                'sample_1.*_copy_ratios.gcnv.bed.gz.tbi$|'
-                'sample_2.*bam$|sample_2.*bam.bai$|'
-                'sample_2.*_copy_ratios.gcnv.bed.gz$|'
-                'sample_2.*_copy_ratios.gcnv.bed.gz.tbi$'
-            ),
-            'artemis_run': '-multiqc.html'
+            'run': '_excluded_intervals.bed$|-multiqc.html'
         }
 
         called_patterns = [x[1]['pattern'] for x in mock_find.call_args_list]
@@ -805,28 +899,18 @@ class TestCheckAllFilesArchivalState(unittest.TestCase):
         dx_requests.check_archival_state to actually check if they're archived
         """
         # define what files each call to dx_requests.find_files should
-        # return, will be called twice for CNV reports (per sample then
-        # per run), then once for each other mode
+        # return, will be called once for all per sample files and then
+        # once for all per run files
         mock_find.side_effect = [
-            ['sample1_segments.vcf', 'sample2_segments.vcf'],
-            ['myRun_excluded_intervals.bed'],
             [
+                'sample1_segments.vcf',
+                'sample2_segments.vcf',
                 'sample1_markdup_recalibrated_Haplotyper.vcf.gz',
                 'sample2_markdup_recalibrated_Haplotyper.vcf.gz',
                 'sample1_per-base.bed.gz',
                 'sample2_reference_build.txt',
-                'sample1_per-base.bed.gz',
-                'sample2_reference_build.txt'
-            ],
-            [
                 'sample1_markdup_recalibrated_tnhaplotyper2.vcf.gz',
                 'sample2_markdup_recalibrated_tnhaplotyper2.vcf.gz',
-                'sample1_per-base.bed.gz',
-                'sample2_reference_build.txt',
-                'sample1_per-base.bed.gz',
-                'sample2_reference_build.txt'
-            ],
-            [
                 'sample1_bam$',
                 'sample1_bam.bai$',
                 'sample1_copy_ratios.gcnv.bed$',
@@ -836,7 +920,7 @@ class TestCheckAllFilesArchivalState(unittest.TestCase):
                 'sample2_copy_ratios.gcnv.bed$',
                 'sample2_copy_ratios.gcnv.bed.tbi$'
             ],
-            ['002_myRun-multiqc.html']
+            ['002_myRun-multiqc.html', 'myRun_excluded_intervals.bed']
         ]
 
         DXManage().check_all_files_archival_state(
@@ -860,14 +944,8 @@ class TestCheckAllFilesArchivalState(unittest.TestCase):
                 'sample2_markdup_recalibrated_Haplotyper.vcf.gz',
                 'sample1_per-base.bed.gz',
                 'sample2_reference_build.txt',
-                'sample1_per-base.bed.gz',
-                'sample2_reference_build.txt',
                 'sample1_markdup_recalibrated_tnhaplotyper2.vcf.gz',
                 'sample2_markdup_recalibrated_tnhaplotyper2.vcf.gz',
-                'sample1_per-base.bed.gz',
-                'sample2_reference_build.txt',
-                'sample1_per-base.bed.gz',
-                'sample2_reference_build.txt',
                 'sample1_bam$',
                 'sample1_bam.bai$',
                 'sample1_copy_ratios.gcnv.bed$',
@@ -1315,6 +1393,39 @@ class TestDXManageUnarchiveFiles(unittest.TestCase):
         self.assertEqual(mock_unarchive.call_count, 3)
 
 
+    @patch('utils.dx_requests.dxpy.DXJob.add_tags')
+    @patch('utils.dx_requests.dxpy.DXJob')
+    @patch('utils.dx_requests.dxpy.api.project_unarchive')
+    @patch('utils.dx_requests.sys.exit')
+    def test_unarchive_called_once_per_project_for_unordered_files(
+            self,
+            exit,
+            mock_unarchive,
+            mock_job,
+            mock_tags
+        ):
+        """
+        Files from the same project may not be next to each other in the
+        given list, test that we still only make one request per project
+        """
+        files = [
+            {'project': 'project-xxx', 'id': 'file-xxx'},
+            {'project': 'project-yyy', 'id': 'file-yyy'},
+            {'project': 'project-xxx', 'id': 'file-zzz'}
+        ]
+
+        DXManage().unarchive_files(files)
+
+        with self.subTest('one call per project'):
+            self.assertEqual(mock_unarchive.call_count, 2)
+
+        with self.subTest('all files for project in one call'):
+            mock_unarchive.assert_any_call(
+                'project-xxx',
+                input_params={'files': ['file-xxx', 'file-zzz']}
+            )
+
+
     @patch(
         'utils.dx_requests.dxpy.api.project_unarchive',
         side_effect=Exception('someDNAnexusAPIError')
@@ -1343,7 +1454,7 @@ class TestDXManageFormatOutputFolders(unittest.TestCase):
     and a time stamp string to build a mapping of stages -> output folders
     """
 
-    @patch('utils.dx_requests.dxpy.describe')
+    @patch('utils.dx_requests.dxpy.api.system_describe_data_objects')
     def test_correct_folder_applet(self, mock_describe):
         """
         Test when an applet is included as a stage that the path is
@@ -1351,7 +1462,9 @@ class TestDXManageFormatOutputFolders(unittest.TestCase):
         'executable' key in the workflow details is just the applet ID
         instead of the human name and version for apps
         """
-        mock_describe.return_value = {'name': 'applet1-v1.2.3'}
+        mock_describe.return_value = {
+            'results': [{'describe': {'name': 'applet1-v1.2.3'}}]
+        }
 
         workflow_details = {
             'name': 'workflow1',
@@ -1378,6 +1491,89 @@ class TestDXManageFormatOutputFolders(unittest.TestCase):
             "Incorrect stage folders returned for applet"
         )
 
+    @patch('utils.dx_requests.dxpy.api.system_describe_data_objects')
+    def test_applets_described_in_one_call(self, mock_describe):
+        """
+        Test when multiple applets are included as stages that these are
+        all described with a single API call, and repeated applets are
+        only requested once
+        """
+        mock_describe.return_value = {
+            'results': [
+                {'describe': {'name': 'applet1-v1.2.3'}},
+                {'describe': {'name': 'applet2-v1.0.0'}}
+            ]
+        }
+
+        workflow_details = {
+            'name': 'workflow1',
+            'stages': [
+                {
+                    'id': 'stage1',
+                    'executable': 'applet-xxx'
+                },
+                {
+                    'id': 'stage2',
+                    'executable': 'applet-yyy'
+                },
+                {
+                    'id': 'stage3',
+                    'executable': 'applet-xxx'
+                }
+            ]
+        }
+
+        returned_stage_folder = DXManage().format_output_folders(
+            workflow=workflow_details,
+            single_output='some_output_path',
+            time_stamp='010123_1303',
+            name='workflow1'
+        )
+
+        correct_stage_folder = {
+            "stage1": "/some_output_path/workflow1/010123_1303/applet1-v1.2.3/",
+            "stage2": "/some_output_path/workflow1/010123_1303/applet2-v1.0.0/",
+            "stage3": "/some_output_path/workflow1/010123_1303/applet1-v1.2.3/"
+        }
+
+        assert mock_describe.call_args[0][0] == {
+            'objects': ['applet-xxx', 'applet-yyy']
+        }, "Applets not described in a single call"
+
+        assert correct_stage_folder == returned_stage_folder, (
+            "Incorrect stage folders returned for multiple applets"
+        )
+
+    @patch('utils.dx_requests.dxpy.api.system_describe_data_objects')
+    def test_error_raised_when_applet_not_described(self, mock_describe):
+        """
+        Test when an applet comes back from the describe call without any
+        describe details that a clear RuntimeError is raised
+        """
+        mock_describe.return_value = {'results': [{}]}
+
+        workflow_details = {
+            'name': 'workflow1',
+            'stages': [
+                {
+                    'id': 'stage1',
+                    'executable': 'applet-xxx'
+                }
+            ]
+        }
+
+        expected_error = (
+            'Unable to describe applet applet-xxx from workflow workflow1'
+        )
+
+        with pytest.raises(RuntimeError, match=expected_error):
+            DXManage().format_output_folders(
+                workflow=workflow_details,
+                single_output='some_output_path',
+                time_stamp='010123_1303',
+                name='workflow1'
+            )
+
     def test_correct_folder_app(self):
         """
         Test when an app is included as a stage that the path is correctly
@@ -1423,6 +1619,7 @@ class TestDXExecuteCNVCalling(unittest.TestCase):
     that expected prints go to stdout since that is the most we can test
     """
     config = {
+        'cnv_call_app_id': 'app-GJZVB2840KK0kxX998QjgXF0',
         'modes': {
             'cnv_call': {
                 'inputs': {
@@ -1609,6 +1806,32 @@ class TestDXExecuteCNVCalling(unittest.TestCase):
         )
 
 
+    def test_exclude_patterns_with_inline_flags(self):
+        """
+        Test when exclude samples are given as patterns with an inline
+        flag (i.e. (?i)) after the first that each is still matched on
+        its own and files are correctly excluded
+        """
+        DXExecute().cnv_calling(
+            config=deepcopy(self.config),
+            single_output_dir='',
+            exclude=['sample2', '(?i)SAMPLE3'],
+            start='',
+            wait=False,
+            unarchive=False
+        )
+
+        stdout = self.capsys.readouterr().out
+
+        correct_exclude = (
+            '2 .bam/.bai files after excluding:\n\tsample1.bam\n\tsample1.bam.bai'
+        )
+
+        assert correct_exclude in stdout, (
+            'exclude samples with inline flags incorrect'
+        )
+
+
     def test_exclude_invalid_sample(self):
         """
         Test when exclude samples is specified with an sample name that
@@ -1697,6 +1920,29 @@ class TestDXExecuteCNVCalling(unittest.TestCase):
             )
 
 
+    def test_assertion_error_raised_on_all_files_excluded(self):
+        """
+        If all BAM files found are excluded an AssertionError should be
+        raised before checking archival state or launching calling
+        """
+        with pytest.raises(
+            AssertionError,
+            match='No BAM files left for CNV calling after excluding'
+        ):
+            DXExecute().cnv_calling(
+                config=deepcopy(self.config),
+                single_output_dir='',
+                exclude=['sample1', 'sample2', 'sample3'],
+                start='',
+                wait=False,
+                unarchive=False
+            )
+
+        with self.subTest('nothing launched'):
+            self.mock_archive.assert_not_called()
+            self.mock_dxapp.assert_not_called()
+
+
 class TestDXExecuteReportsWorkflow(unittest.TestCase):
     """
     Unit tests for DXExecute.reports_workflow
@@ -1906,6 +2152,17 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         self.capsys = capsys
 
 
+    def find_files_by_subdir(self, files):
+        """
+        Build a side effect for find_files from the xlsx, vcf and mosdepth
+        returns, keyed on the subdir searched since the vcf and mosdepth
+        searches are made concurrently and their call order is not fixed
+        """
+        returns = dict(zip([None, 'sentieon-dnaseq', 'eggd_mosdepth'], files))
+
+        return lambda *args, **kwargs: returns[kwargs.get('subdir')]
+
+
     def test_error_raised_if_name_pattern_missing_from_config(self):
         """
         Test when 'name_patterns' parsed from assay config file doesn't
@@ -2115,7 +2372,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         """
         # minimal return of find with vcf structure to pass to simulating
         # no mosdepth files
-        self.mock_find.side_effect = [
+        self.mock_find.side_effect = self.find_files_by_subdir([
             [],
             [{
                 'describe': {
@@ -2123,7 +2380,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
                 }
             }],
             []
-        ]
+        ])
 
         expected_error = (
             "Found no mosdepth files\! SNV reports in \/path_to_single\/ "
@@ -2150,7 +2407,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         check that this function gets called
         """
         # minimal mock of returned vcf and mosdepth files
-        self.mock_find.side_effect = [
+        self.mock_find.side_effect = self.find_files_by_subdir([
             [],
             [{
                 'describe': {
@@ -2173,7 +2430,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
                     }
                 }
             ]
-        ]
+        ])
 
         DXExecute().reports_workflow(
             mode='SNV',
@@ -2199,7 +2456,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         Test if any samples in manifest have no vcfs or mosdepth files
         these get added to the list of returned errors
         """
-        self.mock_find.side_effect = [
+        self.mock_find.side_effect = self.find_files_by_subdir([
             [],
             [{
                 'describe': {
@@ -2222,7 +2479,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
                     }
                 }
             ]
-        ]
+        ])
 
         # patch in an error for adding files to the output of
         # filter_manifest_samples_by_file to check it gets returned
@@ -2261,7 +2518,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         the different files and patterns that we raise an error since
         there's nothing to launch
         """
-        self.mock_find.side_effect = [
+        self.mock_find.side_effect = self.find_files_by_subdir([
             [],
             [{
                 'describe': {
@@ -2284,7 +2541,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
                     }
                 }
             ]
-        ]
+        ])
 
         self.mock_filter_manifest.return_value = [{}, [], []]
 
@@ -2308,7 +2565,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         job is being launched for the same sample this suffix should get
         incremented, check this happens
         """
-        self.mock_find.side_effect = [
+        self.mock_find.side_effect = self.find_files_by_subdir([
             [],
             [{
                 'describe': {
@@ -2331,7 +2588,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
                     }
                 }
             ]
-        ]
+        ])
 
         self.mock_index.return_value = 1
 
@@ -2368,7 +2625,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         does not contain a colon and is replaced with an underscore as
         this breaks file downloads
         """
-        self.mock_find.side_effect = [
+        self.mock_find.side_effect = self.find_files_by_subdir([
             [],
             [{
                 'describe': {
@@ -2391,7 +2648,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
                     }
                 }
             ]
-        ]
+        ])
 
         # minimal manifest with parsed in indications and panels, make
         # first sample have single gene test
@@ -2420,7 +2677,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
         """
         Test when sample limit is set that it works as expected
         """
-        self.mock_find.side_effect = [
+        self.mock_find.side_effect = self.find_files_by_subdir([
             [],
             [{
                 'describe': {
@@ -2443,7 +2700,7 @@ class TestDXExecuteReportsWorkflow(unittest.TestCase):
                     }
                 }
             ]
-        ]
+        ])
 
         DXExecute().reports_workflow(
             mode='SNV',
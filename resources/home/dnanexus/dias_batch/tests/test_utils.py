@@ -20,6 +20,7 @@ sys.path.append(os.path.abspath(
 ))
 
 from utils import utils
+from utils.defaults import epic_control_pattern
 
 
 TEST_DATA_DIR = (
@@ -118,6 +119,26 @@ class TestCheckReportIndex():
             "Wrong suffix returned for sample with no previous report suffix"
         )
 
+    def test_non_xlsx_files_with_suffix_ignored(self):
+        """
+        Test when a previous file found for same samplename stem has an
+        integer suffix but is not an .xlsx file that it is not used
+        """
+        previous_reports = [
+            "X223420-GM2225190_SNV_1.xlsx",
+            "X223420-GM2225190_SNV_5axlsx",
+            "X223420-GM2225190_SNV_6.xlsx.bak"
+        ]
+
+        suffix = utils.check_report_index(
+            name="X223420-GM2225190_SNV",
+            reports=previous_reports
+        )
+
+        assert suffix == 2, (
+            "Wrong suffix returned when non xlsx files have a suffix"
+        )
+
 
 class TestWriteSummaryReport(unittest.TestCase):
     """
@@ -532,6 +553,24 @@ class TestFillConfigReferenceInputs():
             'App missing inputs did not print expected warning'
         )
 
+    def test_non_string_inputs_kept_as_is(self):
+        """
+        Test when an input in the config is not a string (i.e. a list
+        or mapping) that it is added back unchanged and not treated as
+        a reference placeholder
+        """
+        config_copy = deepcopy(self.config)
+        config_copy['modes']['workflow_1']['inputs']['stage_2.input_2'] = [
+            'INPUT-genepanels'
+        ]
+
+        parsed_config = utils.fill_config_reference_inputs(config_copy)
+
+        assert parsed_config['modes']['workflow_1']['inputs'][
+            'stage_2.input_2'] == ['INPUT-genepanels'], (
+                'Non string input incorrectly changed in config'
+            )
+
 
 class TestParseGenePanels():
     """
@@ -1388,6 +1427,25 @@ class TestAddPanelsAndIndicationsToManifest():
         )
 
 
+    def test_panels_for_repeated_test_code_only_built_once(self, capsys):
+        """
+        Panels and indications for a test code should only be built from
+        genepanels once and reused for every sample with the same test,
+        R208.1 is requested for 2 samples in our test manifest and has >1
+        panel so is logged each time it is built
+        """
+        utils.add_panels_and_indications_to_manifest(
+            manifest=self.manifest,
+            genepanels=self.genepanels
+        )
+
+        stdout = capsys.readouterr().out
+
+        assert stdout.count('Test code R208.1 has >1 panel name') == 1, (
+            'Panels for repeated test code built more than once'
+        )
+
+
     def test_hgnc_ids_added(self):
         """
         HGNC IDs should be added to clinical indications and panels lists
@@ -1551,6 +1609,59 @@ class TestCheckExcludeSamples():
         )
 
 
+    @patch('utils.utils.dxpy.find_data_objects')
+    def test_bam_files_searched_for_each_sample_with_limit(
+            self,
+            mock_find
+        ):
+        """
+        When multiple samples to exclude are not in the manifest, we
+        should search for a single BAM file of each of them separately
+        so that sample names given as patterns are matched on their own
+        """
+        samples = [
+            'sample1-a',
+            'sample2-b',
+            'sample-c'
+        ]
+
+        exclude = ['sample-d', 'sample-e']
+
+        # minimal dx find data returns for both sample BAM files present
+        mock_find.side_effect = [
+            [{
+                "id": "file-xxx",
+                "describe": {
+                    "name": "sample-d_some_suffixes.bam"
+                }
+            }],
+            [{
+                "id": "file-yyy",
+                "describe": {
+                    "name": "sample-e_some_suffixes.bam"
+                }
+            }]
+        ]
+
+        # no error should be raised
+        utils.check_exclude_samples(
+            samples=samples,
+            exclude=exclude,
+            mode='reports',
+            single_dir='project-xxx:/output/runX'
+        )
+
+        searched = [
+            (x.kwargs['name'], x.kwargs['limit'])
+            for x in mock_find.call_args_list
+        ]
+
+        assert searched == [
+            ('^sample-d.*.bam$', 1),
+            ('^sample-e.*.bam$', 1)
+        ], 'BAM files not searched for per sample with a limit of 1'
+
+
     @patch('utils.utils.dxpy.find_data_objects')
     def test_excluded_samples_not_in_manifest_and_have_no_bam_files(
             self,
@@ -1611,7 +1722,7 @@ class TestCheckExcludeSamples():
             'sample3.bam'
         ]
 
-        exclude = [r'^\w+-\w+Q\w+-']
+        exclude = [epic_control_pattern]
 
         utils.check_exclude_samples(
             samples=samples,
@@ -1,37 +1,49 @@
+# pattern to match Epic control samples (i.e. 123456-23251Q0013-...) that
+# are excluded by default, defined once as it is both added to and skipped
+# over in the exclude sample names
+epic_control_pattern = r'^\w+-\w+Q\w+-'
+
+# per sample coverage and reference build files required for both SNV and
+# mosaic reports, defined once so the two modes can't drift apart
+reports_sample_file_patterns = (
+    'per-base.bed.gz$',
+    'reference_build.txt$'
+)
+
+# patterns are stored as tuples since these are only ever read, so the
+# defaults can be used directly without being copied for each run
 default_mode_file_patterns = {
     'cnv_reports': {
-        'sample': [
-            '_segments.vcf$'
-        ],
-        'run': [
-            '_excluded_intervals.bed$'
-        ]
+        'sample': (
+            '_segments.vcf$',
+        ),
+        'run': (
+            '_excluded_intervals.bed$',
+        )
     },
     'snv_reports': {
-        'sample': [
+        'sample': (
             '_markdup_recalibrated_Haplotyper.vcf.gz$',
-            'per-base.bed.gz$',
-            'reference_build.txt$'
-        ],
-        'run': []
+            *reports_sample_file_patterns
+        ),
+        'run': ()
     },
     'mosaic_reports': {
-        'sample': [
+        'sample': (
             '_markdup_recalibrated_tnhaplotyper2.vcf.gz',
-            'per-base.bed.gz$',
-            'reference_build.txt$'
-        ],
-        'run': []
+            *reports_sample_file_patterns
+        ),
+        'run': ()
     },
     'artemis': {
-        'sample':[
+        'sample':(
             'bam$',
             'bam.bai$',
             '_copy_ratios.gcnv.bed.gz$',
             '_copy_ratios.gcnv.bed.gz.tbi$'
-        ],
-        'run': [
-            '-multiqc.html'
-        ]
+        ),
+        'run': (
+            '-multiqc.html',
+        )
     }
 }
\ No newline at end of file
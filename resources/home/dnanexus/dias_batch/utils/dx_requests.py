@@ -3,9 +3,8 @@ Functions related to querying and managing objects in DNAnexus, as well
 as running jobs.
 """
 from collections import defaultdict
-from copy import deepcopy
 import concurrent.futures
-from itertools import groupby
+from functools import lru_cache
 import json
 import os
 import re
@@ -32,11 +31,41 @@ from .utils import (
 pd.set_option('display.max_rows', 100)
 pd.set_option('max_colwidth', 1500)
 
+# dxpy shares a single pool of 32 keep-alive connections between all
+# threads, keep concurrent requests within this so that connections are
+# reused rather than new ones opened (and discarded) for each request
+MAX_DX_WORKERS = 32
+
 
 class DXManage():
     """
     Methods for generic handling of dx related things
     """
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def describe_object(dxid) -> dict:
+        """
+        Cached wrapper of dxpy.describe() for objects that are described
+        more than once during a single run (i.e. the same workflow for SNV
+        and mosaic reports, or the same applet across stages)
+
+        n.b. the same dict is returned on every call for a given ID, so
+        this should be treated as read only. The cache may be reset with
+        DXManage.describe_object.cache_clear()
+
+        Parameters
+        ----------
+        dxid : str
+            ID of DNAnexus object to describe
+
+        Returns
+        -------
+        dict
+            describe output of the given object
+        """
+        return dxpy.describe(dxid)
+
+
     def read_assay_config_file(self, file) -> dict:
         """
         Read assay config file specified with -iassay_config_file
@@ -55,10 +84,11 @@ class DXManage():
         contents = self.read_dxfile(file)
         config = json.loads('\n'.join(contents))
 
-        # get the name of the file used for displaying in summary report
-        file_details = dxpy.DXFile(
+        # get the name of the file used for displaying in summary report,
+        # using the cached describe so it is only described once per run
+        file_details = self.describe_object(
             re.match(r'file-[\d\w]+', file).group()
-        ).describe()
+        )
 
         config['name'] = file_details['name']
         config['dxid'] = file_details['id']
@@ -109,7 +139,12 @@ class DXManage():
             name_mode='regexp',
             project=project,
             folder=project_path,
-            describe=True
+            describe={
+                'fields': {
+                    'name': True,
+                    'archivalState': True
+                }
+            }
         ))
 
         # sense check we find config files
@@ -122,6 +157,7 @@ class DXManage():
 
         highest_config = {}
         config_version_files = defaultdict(list)
+        live_files = []
 
         for file in files:
             if not file['describe']['archivalState'] == 'live':
@@ -131,11 +167,21 @@ class DXManage():
                 )
                 continue
 
-            config_data = json.loads(
-                dxpy.DXFile(
-                    project=file['project'],
-                    dxid=file['id']
-                ).read())
+            live_files.append(file)
+
+        def read_config(file) -> str:
+            """dx call to read the contents of a single config file"""
+            return dxpy.DXFile(project=file['project'], dxid=file['id']).read()
+
+        # reading each config is an independent request => read them all
+        # concurrently rather than one after the other
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=MAX_DX_WORKERS
+        ) as executor:
+            contents = list(executor.map(read_config, live_files))
+
+        for file, content in zip(live_files, contents):
+            config_data = json.loads(content)
 
             if not config_data.get('assay') == assay:
                 continue
@@ -206,10 +252,16 @@ class DXManage():
         projects = dxpy.DXFile(dxid=file).list_projects()
         print(f"Found file in {len(projects)} project(s)")
 
-        files = [
-            dxpy.DXFile(dxid=file, project=id).describe()
-            for id in projects.keys()
-        ]
+        def describe_in_project(project) -> dict:
+            """dx call to describe file in a single project context"""
+            return dxpy.DXFile(dxid=file, project=project).describe()
+
+        # these are independent requests => describe concurrently, map()
+        # returns in the same order as the projects are given
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=MAX_DX_WORKERS
+        ) as executor:
+            files = list(executor.map(describe_in_project, projects.keys()))
 
         # filter out any archived files or those resolving
         # to the current job container context
@@ -267,27 +319,39 @@ class DXManage():
 
         path = re.sub(r'^project-[\d\w]+:', '', path)
 
-        files = list(dxpy.find_data_objects(
+        sub_path = f"{path}/{subdir}".lower() if subdir else None
+        files = []
+        not_live = []
+
+        # only return the describe fields we use rather than the full
+        # describe of every file found to keep responses small, and
+        # filter to the sub dir and find non-live files in a single pass
+        # over the results as they are returned
+        for file in dxpy.find_data_objects(
             name=pattern,
             name_mode='regexp',
             project=project,
             folder=path,
             limit=limit,
-            describe=True
-        ))
+            describe={
+                'fields': {
+                    'name': True,
+                    'folder': True,
+                    'archivalState': True
+                }
+            }
+        ):
+            details = file['describe']
 
-        if subdir:
-            # filter down to just those in the given sub dir
-            sub_path = f"{path}/{subdir}".lower()
-            files = [
-                x for x in files
-                if x['describe']['folder'].lower().startswith(sub_path)
-            ]
+            if sub_path and not details['folder'].lower().startswith(sub_path):
+                # not in the given sub dir
+                continue
+
+            files.append(file)
+
+            if details['archivalState'] != 'live':
+                not_live.append(f"{details['name']} ({file['id']})")
 
-        not_live = [
-            f"{x['describe']['name']} ({x['id']})" for x in files
-            if x['describe']['archivalState'] != 'live'
-        ]
         if not_live:
             print(
                 "WARNING: some files found are in an archived state, if these "
@@ -351,7 +415,7 @@ class DXManage():
             )
 
         # sense check that we actually got a project and file ID from above
-        assert all([project, file_id]), (
+        assert project and file_id, (
             "Missing project and / or file ID - "
             f"project: {project}, file: {file_id}"
         )
@@ -402,49 +466,63 @@ class DXManage():
                 "No mode file patterns defined in assay config, using "
                 "default values from utils.defaults"
             )
-            patterns = dict(default_mode_file_patterns)
+            patterns = default_mode_file_patterns
 
         print("Currently defined patterns:")
         prettier_print(patterns)
 
-        sample_files_to_check = []
-        run_files_to_check = []
+        all_sample_patterns = []
+        all_run_patterns = []
 
         for mode, selected in modes.items():
             if not selected:
                 print(f'Running mode {mode} not selected, skipping file check')
                 continue
 
-            mode_sample_patterns = patterns.get(mode, {}).get('sample')
-            mode_run_patterns = patterns.get(mode, {}).get('run')
+            all_sample_patterns.extend(patterns.get(mode, {}).get('sample') or [])
+            all_run_patterns.extend(patterns.get(mode, {}).get('run') or [])
 
-            if mode_sample_patterns:
-                # generate regex pattern per sample for each file pattern,
-                # then join it as one big chongus pattern for a single query
-                # because its not our API server load to worry about
-                sample_patterns = '|'.join([
-                    f"{x}.*{y}" for x in samples for y in mode_sample_patterns
-                ])
-                print(
-                    f"Searching per sample files for {mode} with "
-                    f"{len(mode_sample_patterns)} patterns for {len(samples)} "
-                    "samples"
-                )
+        # combine patterns across all selected modes (dropping those shared
+        # between modes) to search for all files with one query per sample
+        # files and one for run files, instead of two queries per mode
+        all_sample_patterns = list(dict.fromkeys(all_sample_patterns))
+        all_run_patterns = list(dict.fromkeys(all_run_patterns))
 
-                sample_files_to_check.extend(self.find_files(
-                    path=path,
-                    pattern=sample_patterns
-                ))
+        sample_files_to_check = []
+        run_files_to_check = []
 
-            if mode_run_patterns:
-                print(
-                    f"Searching per run files for {mode} with "
-                    f"{len(mode_run_patterns)} patterns"
-                )
-                run_files_to_check.extend(self.find_files(
-                    path=path,
-                    pattern='|'.join(mode_run_patterns)
-                ))
+        if all_sample_patterns and not samples:
+            # no samples to filter by would give an empty pattern that
+            # matches every file in the path => nothing to check
+            print("No samples given, skipping per sample file check")
+        elif all_sample_patterns:
+            # every per sample pattern is just sample name followed by file
+            # pattern => match any of the samples then any of the patterns
+            # for a single query, instead of joining one alternative per
+            # sample and pattern pair that grows as samples x patterns
+            sample_patterns = (
+                f"({'|'.join(samples)}).*({'|'.join(all_sample_patterns)})"
+            )
+            print(
+                f"Searching per sample files for selected modes with "
+                f"{len(all_sample_patterns)} patterns for {len(samples)} "
+                "samples"
+            )
+
+            sample_files_to_check = self.find_files(
+                path=path,
+                pattern=sample_patterns
+            )
+
+        if all_run_patterns:
+            print(
+                f"Searching per run files for selected modes with "
+                f"{len(all_run_patterns)} patterns"
+            )
+            run_files_to_check = self.find_files(
+                path=path,
+                pattern='|'.join(all_run_patterns)
+            )
 
         print(
             f"Found {len(sample_files_to_check)} sample files and "
@@ -530,16 +608,21 @@ class DXManage():
 
         if samples and not_live:
             not_live_filtered = []
+            # track IDs of files already added to check for duplicates
+            # against a set rather than comparing against each dict
+            not_live_filtered_ids = set()
+
+            # startswith() takes a tuple to check all sample names in
+            # one call rather than looping over them for every file
+            sample_prefixes = tuple(samples)
+
             for dx_file in not_live:
-                match = False
-                for name in samples:
-                    if dx_file['describe']['name'].startswith(name):
-                        match = True
-                        break
+                match = dx_file['describe']['name'].startswith(sample_prefixes)
 
-                if match and dx_file not in not_live_filtered:
+                if match and dx_file['id'] not in not_live_filtered_ids:
                     # this file is archived and in one of our samples
                     not_live_filtered.append(dx_file)
+                    not_live_filtered_ids.add(dx_file['id'])
 
             not_live = not_live_filtered
 
@@ -623,27 +706,26 @@ class DXManage():
             Raised if unarchiving fails for a set of project files
         """
         # split list of files into sub lists by project they're present
-        # in in case of multiple projects
-        projects = [
-            list(g) for k, g in groupby(files, lambda x: x['project'])
-        ]
+        # in in case of multiple projects, files from the same project
+        # may not be next to each other in the list so group with a dict
+        # to make a single unarchive request per project
+        projects = defaultdict(list)
+        for file in files:
+            projects[file['project']].append(file['id'])
 
-        for project_files in projects:
+        for project, project_files in projects.items():
             try:
                 dxpy.api.project_unarchive(
-                    project_files[0]['project'],
+                    project,
                     input_params={
-                        "files": [
-                            x['id'] for x in project_files
-                        ]
+                        "files": project_files
                     }
                 )
             except Exception as error:
                 # API spec doesn't list the potential exceptions raised,
                 # catch everything and exit on any error
                 print(
-                    "Error unarchving files for "
-                    f"{project_files[0]['project']}: {error}"
+                    f"Error unarchving files for {project}: {error}"
                 )
                 raise RuntimeError("Error unarchiving files")
 
@@ -713,17 +795,40 @@ class DXManage():
         print("\n \nGenerating output folder structure")
         stage_folders = {}
 
+        # describe all applets in one request instead of one per stage
+        applets = list(dict.fromkeys(
+            stage['executable'] for stage in workflow['stages']
+            if stage['executable'].startswith('applet-')
+        ))
+        applet_names = {}
+
+        if applets:
+            applet_details = dxpy.api.system_describe_data_objects(
+                {"objects": applets}
+            )['results']
+
+            for applet, details in zip(applets, applet_details):
+                if not details.get('describe'):
+                    # applet not accessible or doesn't exist
+                    raise RuntimeError(
+                        f"Unable to describe applet {applet} from workflow "
+                        f"{workflow.get('name')} to set output folder"
+                    )
+
+                applet_names[applet] = details['describe']['name']
+
+        # parent folder is the same for every stage => format it once and
+        # just append each stage folder name to it
+        parent_folder = make_path(single_output, name, time_stamp)
+
         for stage in workflow['stages']:
             if stage['executable'].startswith('applet-'):
-                applet_details = dxpy.describe(stage['executable'])
-                folder_name = applet_details['name']
+                folder_name = applet_names[stage['executable']]
             else:
                 folder_name = stage['executable'].replace(
                     'app-', '', 1).replace('/', '-')
 
-            path = make_path(single_output, name, time_stamp, folder_name)
-
-            stage_folders[stage['id']] = path
+            stage_folders[stage['id']] = f"{parent_folder}{folder_name}/"
 
         print("Output folders to use:")
         prettier_print(stage_folders)
@@ -778,17 +883,6 @@ class DXExecute():
         print("\n \nBuilding inputs for CNV calling")
         cnv_config = config['modes']['cnv_call']
 
-        # check if we're searching for files in different project,
-        # and set the project input name accordingly
-        remote_project = re.match(r"project-[\w]+", single_output_dir)
-        if remote_project:
-            project_name = dxpy.describe(remote_project.group()).get('name')
-        else:
-            project_name = dxpy.describe(
-                os.environ.get('DX_PROJECT_CONTEXT_ID')).get('name')
-
-        cnv_config['inputs']['run_name'] = project_name
-
         files = DXManage().find_files(
             pattern=cnv_config['inputs']['bambais']['name'],
             path=single_output_dir,
@@ -814,21 +908,21 @@ class DXExecute():
                 mode='calling'
             )
 
-            # get the files we are excluding to log in the summary report
-            excluded_files = [
-                file['describe']['name'] for file in files
-                if any([
-                    re.match(x, file['describe']['name']) for x in exclude
-                ])
-            ]
+            # compile each exclude pattern once (separately, as joining
+            # them would change how flags and backreferences behave), then
+            # split files into those we are excluding (to log in the
+            # summary report) and those we're not in a single pass
+            exclude_patterns = [re.compile(x) for x in exclude]
+            kept_files = []
 
-            # get the files of samples we're not excluding
-            files = [
-                file for file in files
-                if not any([
-                    re.match(x, file['describe']['name']) for x in exclude
-                ])
-            ]
+            for file in files:
+                name = file['describe']['name']
+                if any(pattern.match(name) for pattern in exclude_patterns):
+                    excluded_files.append(name)
+                else:
+                    kept_files.append(file)
+
+            files = kept_files
 
             printable_files = '\n\t'.join([x['describe']['name'] for x in files])
             print(
@@ -836,12 +930,28 @@ class DXExecute():
                 f"\n\t{printable_files}"
             )
 
-            printable_excluded = '\n\t'.join([x for x in excluded_files])
+            printable_excluded = '\n\t'.join(excluded_files)
             print(
                 f"{len(excluded_files)} .bam/.bai files excluded:"
                 f"\n\t{printable_excluded}"
             )
 
+            # return early before any further requests or launching a
+            # job that will fail if we've excluded everything
+            assert files, "No BAM files left for CNV calling after excluding"
+
+        # check if we're searching for files in different project,
+        # and set the project input name accordingly
+        remote_project = re.match(r"project-[\w]+", single_output_dir)
+        if remote_project:
+            project_name = DXManage().describe_object(
+                remote_project.group()).get('name')
+        else:
+            project_name = DXManage().describe_object(
+                os.environ.get('DX_PROJECT_CONTEXT_ID')).get('name')
+
+        cnv_config['inputs']['run_name'] = project_name
+
         # check to ensure all bams are unarchived
         DXManage().check_archival_state(
             sample_files=files,
@@ -852,7 +962,7 @@ class DXExecute():
         cnv_config['inputs']['bambais'] = files
 
         # set output folder relative to single dir
-        app_details = dxpy.describe(config.get('cnv_call_app_id'))
+        app_details = DXManage().describe_object(config.get('cnv_call_app_id'))
         folder = make_path(
             single_output_dir,
             f"{app_details['name']}-{app_details['version']}",
@@ -870,7 +980,8 @@ class DXExecute():
             instance_type=cnv_config.get('instance_type')
         )
 
-        job_id = job.describe().get('id')
+        # ID is already held by the returned handler, no need to describe
+        job_id = job.get_id()
         job_handle = dxpy.DXJob(dxid=job_id)
 
         if wait:
@@ -977,21 +1088,29 @@ class DXExecute():
 
         # find all previous xlsx reports to use for indexing report names
         print("\n \nSearching for previous xlsx reports")
-        xlsx_reports = DXManage().find_files(
+        xlsx_reports = []
+
+        # group previous reports by the sample prefix of their name (i.e.
+        # the part before the first underscore) so that indexing each new
+        # report only checks that sample's reports and not every report,
+        # done in the same pass as taking the names from the files found
+        xlsx_reports_by_prefix = defaultdict(list)
+
+        for file in DXManage().find_files(
             path=single_output_dir,
             pattern=r".xlsx$"
-        )
-        xlsx_reports = [
-            x['describe']['name'] for x in xlsx_reports
-        ]
+        ):
+            report = file['describe']['name']
+            xlsx_reports.append(report)
+            xlsx_reports_by_prefix[report.partition('_')[0]].append(report)
+
         if xlsx_reports:
             reports = '\n\t'.join(sorted(xlsx_reports))
             print(f"xlsx reports found:\n\t{reports}")
 
-
         # this will either be Epic, Gemini or both
-        manifest_source = sorted(set([
-            x['manifest_source'] for x in manifest.values()]))
+        manifest_source = sorted({
+            x['manifest_source'] for x in manifest.values()})
 
         if manifest_source == ['Epic']:
             pattern = name_patterns.get('Epic')
@@ -1030,11 +1149,11 @@ class DXExecute():
             vcf_name = config.get('inputs').get(vcf_input_field).get('name')
 
             print('\n \nSearching for excluded intervals bed file')
-            excluded_intervals_bed_file = list(DXManage().find_files(
-                path=f"{job_details.get('project')}:{job_details.get('folder')}",
+            excluded_intervals_bed_file = DXManage().find_files(
+                path=vcf_dir,
                 pattern="_excluded_intervals.bed$",
                 limit=1
-            ))
+            )
 
             if not excluded_intervals_bed_file:
                 raise RuntimeError(
@@ -1049,10 +1168,10 @@ class DXExecute():
             }
 
             print("\n \nSearching for VCF files")
-            vcf_files = list(DXManage().find_files(
+            vcf_files = DXManage().find_files(
                 path=vcf_dir,
                 pattern=vcf_name
-            ))
+            )
 
             if not vcf_files:
                 raise RuntimeError(
@@ -1061,7 +1180,7 @@ class DXExecute():
 
             print(
                 "VCFs found:\n\t", '\n\t'.join(
-                    sorted([x['describe']['name'] for x in vcf_files])
+                    sorted(x['describe']['name'] for x in vcf_files)
                 )
             )
 
@@ -1075,13 +1194,14 @@ class DXExecute():
                     single_dir=single_output_dir
                 )
 
+                exclude_set = set(exclude)
                 excluded = [
-                    sample for sample in manifest.keys() if sample in exclude
+                    sample for sample in manifest.keys() if sample in exclude_set
                 ]
 
                 manifest = {
                     sample: config for sample, config in manifest.items()
-                    if sample not in excluded
+                    if sample not in exclude_set
                 }
 
                 print(
@@ -1100,21 +1220,37 @@ class DXExecute():
         elif mode in ('SNV', 'mosaic'):
             vcf_input_field = 'stage-rpt_vep.vcf'
 
-            vcf_dir = config.get('inputs').get(vcf_input_field).get('folder')
-            vcf_name = config.get('inputs').get(vcf_input_field).get('name')
-
-            mosdepth_dir = config.get('inputs').get(
-                'stage-rpt_athena.mosdepth_files').get('folder')
-            mosdepth_name = config.get('inputs').get(
-                'stage-rpt_athena.mosdepth_files').get('name')
-
-            print("\n \nSearching for VCF files")
+            vcf_config = config.get('inputs').get(vcf_input_field)
+            mosdepth_config = config.get('inputs').get(
+                'stage-rpt_athena.mosdepth_files')
+
+            vcf_dir = vcf_config.get('folder')
+            vcf_name = vcf_config.get('name')
+
+            mosdepth_dir = mosdepth_config.get('folder')
+            mosdepth_name = mosdepth_config.get('name')
+
+            # the vcf and mosdepth searches are independent requests => run
+            # them concurrently, keeping them as separate queries
+            print("\n \nSearching for VCF and mosdepth files")
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=2
+            ) as executor:
+                vcf_search = executor.submit(
+                    DXManage().find_files,
+                    path=single_output_dir,
+                    subdir=vcf_dir,
+                    pattern=vcf_name
+                )
+                mosdepth_search = executor.submit(
+                    DXManage().find_files,
+                    path=single_output_dir,
+                    subdir=mosdepth_dir,
+                    pattern=mosdepth_name
+                )
 
-            vcf_files = DXManage().find_files(
-                path=single_output_dir,
-                subdir=vcf_dir,
-                pattern=vcf_name
-            )
+            vcf_files = vcf_search.result()
+            mosdepth_files = mosdepth_search.result()
 
             if not vcf_files:
                 error = (
@@ -1126,17 +1262,10 @@ class DXExecute():
 
             print(
                 "VCFs found:\n\t", '\n\t'.join(
-                    sorted([x['describe']['name'] for x in vcf_files])
+                    sorted(x['describe']['name'] for x in vcf_files)
                 )
             )
 
-            print("\n \nSearching for mosdepth files")
-            mosdepth_files = DXManage().find_files(
-                path=single_output_dir,
-                subdir=mosdepth_dir,
-                pattern=mosdepth_name
-            )
-
             if not mosdepth_files:
                 error = (
                     f"Found no mosdepth files! {mode} reports in "
@@ -1204,7 +1333,7 @@ class DXExecute():
             unarchive=unarchive
         )
 
-        workflow_details = dxpy.describe(workflow_id)
+        workflow_details = DXManage().describe_object(workflow_id)
 
         workflow_name = (
             f"{workflow_details['name']}_{mode}" if mode in ['SNV', 'mosaic']
@@ -1234,6 +1363,22 @@ class DXExecute():
 
         # initialise per sample summary dict from samples in manifest
         sample_summary = {mode: {k: [] for k in manifest.keys()}}
+        mode_summary = sample_summary[mode]
+
+        # workflow handler and instance types are the same for every
+        # launch => set these up once outside of the loop
+        workflow = dxpy.DXWorkflow(dxid=workflow_id)
+        stage_instance_types = config.get("stage_instance_types")
+
+        # inputs from the config and the excluded intervals bed are the
+        # same for every launch => set these once outside of the loop
+        base_input = dict(config['inputs'])
+
+        if excluded_intervals_bed:
+            # will only exist if this is for CNVs
+            base_input[
+                "stage-cnv_annotate_excluded_regions.excluded_regions"
+            ] = excluded_intervals_bed
 
         # launch reports workflow, once per sample -> set of test codes
         for sample, sample_config in manifest.items():
@@ -1241,6 +1386,38 @@ class DXExecute():
             all_test_lists = sample_config['tests']
             vcf = sample_config['vcf'][0]  # TODO : need to test for >1 VCF?
 
+            # sample part of report and job names is the same for every
+            # test list of this sample => only build these once
+            vcf_prefix = vcf['describe']['name'].partition('_')[0]
+            job_name_prefix = f"{workflow_details['name']}_{sample}"
+
+            # vcf and mosdepth file links for this sample are shared by
+            # all of its test lists, build these once per sample
+            vcf_link = {
+                "$dnanexus_link": {
+                    "project": vcf['project'],
+                    "id": vcf['id']
+                }
+            }
+
+            # build mosdepth files as a list of dx_links for athena
+            mosdepth_links = [
+                {"$dnanexus_link": {
+                    "project": file['project'],
+                    "id": file['id']
+                }}
+                for file in sample_config.get('mosdepth', [])
+            ]
+
+            # add vcf found for sample to input dict, currently just
+            # needs providing to VEP for both workflows
+            sample_input = dict(base_input)
+            sample_input[vcf_input_field] = vcf_link
+
+            if mosdepth_links:
+                # will only exist if this is for SNVs
+                sample_input["stage-rpt_athena.mosdepth_files"] = mosdepth_links
+
             # mapping for current sample name -> index suffix to handle
             # edge case of same test code on same run
             sample_name_to_suffix = {}
@@ -1252,17 +1429,6 @@ class DXExecute():
                     f"{sample} with test(s): {test_list}"
                 )
 
-                input = deepcopy(config['inputs'])
-
-                # add vcf found for sample to input dict, currently just
-                # needs providing to VEP for both workflows
-                input[vcf_input_field] = {
-                    "$dnanexus_link": {
-                        "project": vcf['project'],
-                        "id": vcf['id']
-                    }
-                }
-
                 # format required string inputs of panels and indications
                 panels = ';'.join(sample_config['panels'][idx])
                 indications = ';'.join(sample_config['indications'][idx])
@@ -1270,11 +1436,13 @@ class DXExecute():
 
                 # set prefix for naming output report with integer suffix
                 name = (
-                    f"{vcf['describe']['name'].split('_')[0]}_"
-                    f"{'_'.join(test_list)}_{mode}"
+                    f"{vcf_prefix}_{'_'.join(test_list)}_{mode}"
                 ).replace(':', '_').replace('__', '_')
 
-                suffix = check_report_index(name=name, reports=xlsx_reports)
+                suffix = check_report_index(
+                    name=name,
+                    reports=xlsx_reports_by_prefix.get(name.partition('_')[0], [])
+                )
 
                 if sample_name_to_suffix.get(name):
                     # we have already launched a report for this sample in
@@ -1289,29 +1457,11 @@ class DXExecute():
                 sample_name_to_suffix[name] = suffix
                 name = f"{name}_{suffix}"
 
-                # build mosdepth files as a list of dx_links for athena
-                mosdepth_links = [
-                    {"$dnanexus_link": {
-                        "project": file['project'],
-                        "id": file['id']
-                    }}
-                    for file in sample_config.get('mosdepth', [])
-                ]
-
-                if mosdepth_links:
-                    # will only exist if this is for SNVs
-                    input["stage-rpt_athena.mosdepth_files"] = mosdepth_links
-
-                if excluded_intervals_bed:
-                    # will only exist if this is for CNVs
-                    input[
-                        "stage-cnv_annotate_excluded_regions.excluded_regions"
-                    ] = excluded_intervals_bed
-
                 # all combinations of placeholder text that can be in the
-                # config and values to replace with
+                # config and values to replace with, this returns a new
+                # dict so the sample inputs are not modified between tests
                 input = add_dynamic_inputs(
-                    config=input,
+                    config=sample_input,
                     clinical_indications=indications,
                     test_codes=codes,
                     panels=panels,
@@ -1319,27 +1469,23 @@ class DXExecute():
                 )
 
                 # now we can finally run the reports workflow
-                job_handle = dxpy.DXWorkflow(
-                    dxid=workflow_id
-                ).run(
+                job_handle = workflow.run(
                     workflow_input=input,
                     rerun_stages=['*'],
                     detach=True,
-                    name=f"{workflow_details['name']}_{sample}_{codes} ({mode})",
+                    name=f"{job_name_prefix}_{codes} ({mode})",
                     folder=parent_folder,
                     stage_folders=stage_folders,
-                    stage_instance_types=config.get("stage_instance_types"),
+                    stage_instance_types=stage_instance_types,
                     depends_on=parent
                 )
 
                 launched_jobs.append(job_handle._dxid)
-                sample_summary[mode][sample].append(name)
+                mode_summary[sample].append(name)
 
             # finished launching this samples test job(s) => join up
             # multiple outputs for nicer output viewing
-            sample_summary[mode][sample] = '\n'.join(
-                sample_summary[mode][sample]
-            )
+            mode_summary[sample] = '\n'.join(mode_summary[sample])
 
             samples_run += 1
             if samples_run == sample_limit:
@@ -1399,7 +1545,7 @@ class DXExecute():
             job ID of launched job
         """
         print("Launching eggd_artemis")
-        details = dxpy.describe(app_id)
+        details = DXManage().describe_object(app_id)
         path = make_path(single_output_dir, details['name'], start)
 
         app_input = {
@@ -1444,7 +1590,9 @@ class DXExecute():
             else:
                 dxpy.DXAnalysis(dxid=job).terminate()
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=32) as executor:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=MAX_DX_WORKERS
+        ) as executor:
             concurrent_jobs = {
                 executor.submit(terminate_one, id):
                 id for id in sorted(jobs, reverse=True)
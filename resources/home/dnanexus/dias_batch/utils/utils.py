@@ -11,15 +11,22 @@ from time import strftime, localtime
 from typing import Tuple
 
 import dxpy
-from packaging.version import Version
 import pandas as pd
 
+from .defaults import epic_control_pattern
+
 
 # for prettier viewing in the logs
 pd.set_option('display.max_rows', 200)
 pd.set_option('max_colwidth', 1500)
 PPRINT = PrettyPrinter(indent=2, width=1000).pprint
 
+# test code (i.e. R134.1) and HGNC ID patterns, compiled once at import
+# since these get matched against every test of every sample
+TEST_CODE_REGEX = re.compile(r'[RC][\d]+\.[\d]+')
+HGNC_ID_REGEX = re.compile(r'_HGNC:[\d]+')
+TEST_CODE_OR_HGNC_REGEX = re.compile(r'[RC][\d]+\.[\d]+|_HGNC:[\d]+')
+
 
 def time_stamp() -> str:
     """
@@ -70,23 +77,15 @@ def check_report_index(name, reports) -> int:
     int
         suffix to add to report name
     """
-    suffix = 0
-    previous_reports = [x for x in reports if x.startswith(name)]
-
-    if previous_reports:
-        # some previous reports, try get highest suffix
-        suffixes = [
-            re.search(r'[\d]{1,2}.xlsx$', x) for x in previous_reports
-            if re.search(r'[\d]{1,2}.xlsx$', x)
-        ]
-
-        if suffixes:
-            # found something useful, if not we're just going to use 1
-            suffix = max([
-                int(x.group().replace('.xlsx', '')) for x in suffixes if x
-            ])
+    # single pass over previous reports for this name, searching each
+    # once for a suffix and taking the highest found (or 0 if none), the
+    # cheap endswith check skips the regex for anything not an xlsx
+    suffixes = (
+        re.search(r'([\d]{1,2})\.xlsx$', x) for x in reports
+        if x.startswith(name) and x.endswith('.xlsx')
+    )
 
-    return suffix + 1
+    return max((int(x.group(1)) for x in suffixes if x), default=0) + 1
 
 
 def write_summary_report(output, job, app, manifest=None, **summary) -> None:
@@ -113,102 +112,113 @@ def write_summary_report(output, job, app, manifest=None, **summary) -> None:
     print(f"\n \nWriting summary report to {output}")
 
     time = strftime('%Y-%m-%d %H:%M:%S', localtime(job['created'] / 1000))
+    # sort on just the input names rather than (name, value) tuples
     inputs = job['runInput']
-    inputs = "\n\t".join([f"{x[0]}: {x[1]}" for x in sorted(inputs.items())])
+    inputs = "\n\t".join([f"{x}: {inputs[x]}" for x in sorted(inputs)])
 
-    with open(output, 'w') as file_handle:
-        file_handle.write(
-            f"Jobs launched from {app.get('name')} ({app.get('version')}) at {time} "
-            f"by {job['launchedBy'].replace('user-', '')} in {job['id']}\n"
-        )
+    # build up the report in memory and write it out in one go rather
+    # than many small writes to the file
+    report = []
 
-        file_handle.write(
-            f"\nAssay config file used {summary.get('assay_config')['name']} "
-            f"({summary.get('assay_config')['dxid']})\n"
-        )
+    report.append(
+        f"Jobs launched from {app.get('name')} ({app.get('version')}) at {time} "
+        f"by {job['launchedBy'].replace('user-', '')} in {job['id']}\n"
+    )
 
-        file_handle.write(f"\nJob inputs:\n\t{inputs}\n")
+    report.append(
+        f"\nAssay config file used {summary.get('assay_config')['name']} "
+        f"({summary.get('assay_config')['dxid']})\n"
+    )
 
-        if manifest:
-            file_handle.write(
-                f"\nManifest(s) parsed: {job['runInput']['manifest_files']}\n"
-            )
-            file_handle.write(
-                "\nTotal number of samples in provided manifest(s): "
-                f"{len(summary.get('provided_manifest_samples'))}"
-            )
-            file_handle.write(
-                f"\nTotal number of samples processed from manifest(s): "
-                f"{len(manifest.keys())}"
-            )
+    report.append(f"\nJob inputs:\n\t{inputs}\n")
 
-            not_processed = sorted(
-                set(summary.get('provided_manifest_samples')) -
-                set(manifest.keys())
-            )
-            file_handle.write(
-                f"\nSamples from manifest(s) not processed "
-                f"({len(not_processed)}): "
-                f"{', '.join(not_processed) if not_processed else 'None'}\n"
-            )
+    if manifest:
+        report.append(
+            f"\nManifest(s) parsed: {job['runInput']['manifest_files']}\n"
+        )
+        report.append(
+            "\nTotal number of samples in provided manifest(s): "
+            f"{len(summary.get('provided_manifest_samples'))}"
+        )
+        report.append(
+            f"\nTotal number of samples processed from manifest(s): "
+            f"{len(manifest.keys())}"
+        )
 
-        if summary.get('excluded'):
-            file_handle.write(
-                "\nSamples specified to exclude from CNV calling and CNV "
-                f"reports ({len(summary.get('excluded'))}): "
-                f"{', '.join(sorted(summary.get('excluded')))}"
-            )
+        # manifest is already hashed by sample => take the difference
+        # against it directly instead of building another set of its keys
+        not_processed = sorted(
+            set(summary.get('provided_manifest_samples')).difference(manifest)
+        )
+        report.append(
+            f"\nSamples from manifest(s) not processed "
+            f"({len(not_processed)}): "
+            f"{', '.join(not_processed) if not_processed else 'None'}\n"
+        )
 
-        if summary.get('cnv_call_excluded'):
-            file_handle.write(
-                "\nFiles matched and excluded from CNV calling "
-                f"({len(summary.get('cnv_call_excluded'))}): "
-                f"{', '.join(sorted(summary.get('cnv_call_excluded')))}"
-            )
+    if summary.get('excluded'):
+        report.append(
+            "\nSamples specified to exclude from CNV calling and CNV "
+            f"reports ({len(summary.get('excluded'))}): "
+            f"{', '.join(sorted(summary.get('excluded')))}"
+        )
 
-        launched_jobs = '\n\t'.join([
-            f"{k} : {len(v)} jobs" if len(v) > 1
-            else f"{k} : {len(v)} job"
-            for k, v in summary.get('launched_jobs').items()
-        ])
+    if summary.get('cnv_call_excluded'):
+        report.append(
+            "\nFiles matched and excluded from CNV calling "
+            f"({len(summary.get('cnv_call_excluded'))}): "
+            f"{', '.join(sorted(summary.get('cnv_call_excluded')))}"
+        )
 
-        file_handle.write(f"\nTotal jobs launched:\n\t{launched_jobs}\n")
+    launched_jobs = '\n\t'.join([
+        f"{k} : {len(v)} jobs" if len(v) > 1
+        else f"{k} : {len(v)} job"
+        for k, v in summary.get('launched_jobs').items()
+    ])
 
-        report_summaries = {
-            "snv_report_errors": "SNV",
-            "cnv_report_errors": "CNV",
-            "mosaic_report_errors": "mosaic"
-        }
+    report.append(f"\nTotal jobs launched:\n\t{launched_jobs}\n")
 
-        # write summary of errors from each report stage if present
-        for key, word in report_summaries.items():
-            if summary.get(key):
-                errors = '\n\t'.join([
-                    f"{k} : {v}" for k, v in summary.get(key).items()
-                ])
-                file_handle.write(
-                    f"\nErrors in launching {word} reports:\n\t{errors}\n"
-                )
+    report_summaries = {
+        "snv_report_errors": "SNV",
+        "cnv_report_errors": "CNV",
+        "mosaic_report_errors": "mosaic"
+    }
 
-        # mush the report summary dicts together to make a pretty table
-        outputs = {}
-        if summary.get('cnv_report_summary'):
-            outputs = {**outputs, **summary.get('cnv_report_summary')}
-        if summary.get('snv_report_summary'):
-            outputs = {**outputs, **summary.get('snv_report_summary')}
-        if summary.get('mosaic_report_summary'):
-            outputs = {**outputs, **summary.get('mosaic_report_summary')}
-
-        if outputs:
-            fancy_table = pd.DataFrame(outputs)
-            fancy_table.fillna(value='-', inplace=True)
-            fancy_table = fancy_table.to_markdown(tablefmt="grid")
-            file_handle.write(
-                f"\nReports created per sample:\n\n{fancy_table}"
+    # write summary of errors from each report stage if present
+    for key, word in report_summaries.items():
+        if summary.get(key):
+            errors = '\n\t'.join([
+                f"{k} : {v}" for k, v in summary.get(key).items()
+            ])
+            report.append(
+                f"\nErrors in launching {word} reports:\n\t{errors}\n"
             )
 
-    # dump written file into logs
-    print('\n'.join(open(output, 'r').read().splitlines()))
+    # mush the report summary dicts together to make a pretty table,
+    # updating one dict in place rather than rebuilding it for each
+    outputs = {}
+    for key in (
+        'cnv_report_summary', 'snv_report_summary', 'mosaic_report_summary'
+    ):
+        if summary.get(key):
+            outputs.update(summary.get(key))
+
+    if outputs:
+        fancy_table = pd.DataFrame(outputs)
+        fancy_table.fillna(value='-', inplace=True)
+        fancy_table = fancy_table.to_markdown(tablefmt="grid")
+        report.append(
+            f"\nReports created per sample:\n\n{fancy_table}"
+        )
+
+    report = ''.join(report)
+
+    with open(output, 'w') as file_handle:
+        file_handle.write(report)
+
+    # dump written report into logs from memory instead of reading the
+    # file we just wrote back in
+    print('\n'.join(report.splitlines()))
 
 
 def make_path(*path) -> str:
@@ -227,7 +237,7 @@ def make_path(*path) -> str:
         nicely formatted path with leading and trailing forward slash
     """
     path = '/'.join([
-        re.sub(r"project-[\d\w]+:", "", x).lstrip('/').rstrip('/')
+        re.sub(r"project-[\d\w]+:", "", x).strip('/')
         for x in path if x
     ])
 
@@ -265,6 +275,17 @@ def fill_config_reference_inputs(config) -> dict:
     for mode in filled_config['modes']:
         filled_config['modes'][mode]['inputs'] = {}
 
+    # map each placeholder to its reference once, instead of formatting
+    # and checking every reference against every input of every mode
+    placeholders = {
+        f'INPUT-{reference}': reference
+        for reference in config['reference_files']
+    }
+
+    # the same reference is commonly an input to more than one mode
+    # => only build the dx link for each the first time it is used
+    reference_links = {}
+
     for mode, mode_config in config['modes'].items():
         if not mode_config.get('inputs'):
             print(
@@ -273,19 +294,17 @@ def fill_config_reference_inputs(config) -> dict:
             )
             continue
         for input, value in mode_config['inputs'].items():
-            match = False
-            for reference, file_id in config['reference_files'].items():
-                if not value == f'INPUT-{reference}':
-                    continue
+            reference = (
+                placeholders.get(value) if isinstance(value, str) else None
+            )
 
-                # this input is a match => add this ref file ID as
-                # the input and move to next input
-                match = True
+            if reference is None:
+                # this input isn't a reference file => add back as is
+                filled_config['modes'][mode]['inputs'][input] = value
+                continue
 
-                if isinstance(file_id, dict):
-                    # being provided as $dnanexus_link format, use it
-                    # as is and assume its formatted correctly
-                    filled_config['modes'][mode]['inputs'][input] = file_id
+            if reference not in reference_links:
+                file_id = config['reference_files'][reference]
 
                 if isinstance(file_id, str):
                     # provided as string (i.e. project-xxx:file-xxx)
@@ -294,14 +313,14 @@ def fill_config_reference_inputs(config) -> dict:
 
                     # format correctly as dx link
                     if project and file:
-                        dx_link = {
+                        file_id = {
                             "$dnanexus_link": {
                                 "project": project.group(),
                                 "id": file.group()
                             }
                         }
                     elif file and not project:
-                        dx_link = {"$dnanexus_link": file.group()}
+                        file_id = {"$dnanexus_link": file.group()}
                     else:
                         # not found a file ID
                         raise RuntimeError(
@@ -309,13 +328,13 @@ def fill_config_reference_inputs(config) -> dict:
                             f"valid: {reference} : {file_id}"
                         )
 
-                    filled_config['modes'][mode]['inputs'][input] = dx_link
+                # else being provided as $dnanexus_link format, use it
+                # as is and assume its formatted correctly
+                reference_links[reference] = file_id
 
-                break
-
-            if not match:
-                # this input isn't a reference file => add back as is
-                filled_config['modes'][mode]['inputs'][input] = value
+            filled_config['modes'][mode]['inputs'][input] = (
+                reference_links[reference]
+            )
 
     print("And now it's filled:")
     prettier_print(filled_config)
@@ -351,12 +370,15 @@ def parse_genepanels(contents) -> pd.DataFrame:
         DataFrame of genepanels file
     """
     # genepanels file may have 3 or 4 columns as it can also contain HGNC
-    # ID and PanelApp panel ID, just use the first 2 columns
+    # ID and PanelApp panel ID, just use the first 2 columns. Only split
+    # these off each line and keep the first of each unique pair as we go,
+    # instead of building a dataframe of every gene row to drop duplicates
+    unique_rows = dict.fromkeys(tuple(x.split('\t', 2)[:2]) for x in contents)
+
     genepanels = pd.DataFrame(
-        [x.split('\t')[:2] for x in contents],
+        list(unique_rows),
         columns=['indication', 'panel_name']
     )
-    genepanels.drop_duplicates(keep='first', inplace=True)
     genepanels.reset_index(inplace=True)
     genepanels = split_genepanels_test_codes(genepanels)
 
@@ -402,18 +424,23 @@ def split_genepanels_test_codes(genepanels) -> pd.DataFrame:
         Raised when test code links to more than one clinical indication
     """
     genepanels['test_code'] = genepanels['indication'].apply(
-        lambda x: x.split('_')[0] if re.match(r'[RC][\d]+\.[\d]+', x) else x
+        lambda x: x.partition('_')[0] if TEST_CODE_REGEX.match(x) else x
     )
     genepanels = genepanels[['test_code', 'indication', 'panel_name']]
 
-    # sense check test code only points to one unique indication
-    for code in set(genepanels['test_code'].tolist()):
+    # sense check test code only points to one unique indication, count
+    # these for all codes in one groupby rather than filtering per code,
+    # keeping missing indications as a value like a set of them would
+    multiple_indications = genepanels.groupby('test_code')[
+        'indication'].nunique(dropna=False) > 1
+
+    if multiple_indications.any():
+        code = multiple_indications[multiple_indications].index[0]
         code_rows = genepanels[genepanels['test_code'] == code]
-        if len(set(code_rows['indication'].tolist())) > 1:
-            raise RuntimeError(
-                f"Test code {code} linked to more than one indication in "
-                f"genepanels!\n\t{code_rows['indication'].tolist()}"
-            )
+        raise RuntimeError(
+            f"Test code {code} linked to more than one indication in "
+            f"genepanels!\n\t{code_rows['indication'].tolist()}"
+        )
 
     print(f"Genepanels file: \n{genepanels}")
 
@@ -475,29 +502,36 @@ def parse_manifest(contents, split_tests=False, subset=None) -> Tuple[pd.DataFra
 
     if all('\t' in x for x in contents if x):
         # this is an old Gemini manifest => should just have sampleID -> CI
-        contents = [x.split('\t') for x in contents if x]
-
         source = 'Gemini'
+        data = {}
 
-        # sense check data does only have 2 columns
-        assert all([len(x) == 2 for x in contents]), (
-            f"Gemini manifest has more than 2 columns:\n\t{contents}"
-        )
+        # source is the same for every sample => share the one dict
+        sample_source = {'manifest_source': source}
 
-        # initialise a dict of sample names to add tests to
-        sample_names = {x[0] for x in contents}
-        data = {name: {'tests': [[]]} for name in sample_names}
+        # single pass over the lines, partition gives the 2 columns
+        # without building a list per line
+        for line in contents:
+            if not line:
+                continue
+
+            sample, _, tests = line.partition('\t')
+
+            # sense check data does only have 2 columns
+            assert '\t' not in tests, (
+                f"Gemini manifest has more than 2 columns:\n\t{line}"
+            )
 
-        for sample, tests in contents:
+            # initialise sample in dict to add tests to
+            data.setdefault(sample, {'tests': [[]]})
             test_codes = tests.replace(' ', '').split(',')
 
-            manifest_source[sample] = {'manifest_source': 'Gemini'}
+            manifest_source[sample] = sample_source
 
             for test_code in test_codes:
                 # add test codes to samples list, keeping just the code part
                 # and not full string (i.e. R134.2 from
                 # R134.1_Familialhypercholesterolaemia_P)
-                match = re.match(r"[RC][\d]+\.[\d]+|_HGNC:[\d]+", test_code)
+                match = TEST_CODE_OR_HGNC_REGEX.match(test_code)
                 if match:
                     code = match.group()
                 else:
@@ -524,7 +558,7 @@ def parse_manifest(contents, split_tests=False, subset=None) -> Tuple[pd.DataFra
             'Re-analysis Specimen ID', 'Test Codes'
         ]
 
-        assert not set(required) - set(manifest.columns.tolist()), (
+        assert not set(required).difference(manifest.columns), (
             "Missing one or more required columns from Epic manifest"
         )
 
@@ -535,9 +569,10 @@ def parse_manifest(contents, split_tests=False, subset=None) -> Tuple[pd.DataFra
             'Re-analysis Specimen ID', 'Test Codes'
         ]
 
-        # remove any spaces and SP- from specimen columns
-        manifest[columns] = manifest[columns].applymap(
-            lambda x: x.replace(' ', '') if x else x)
+        # remove any spaces and SP- from specimen columns, done column-wise
+        # with vectorised string methods instead of a lambda per cell
+        manifest[columns] = manifest[columns].apply(
+            lambda column: column.str.replace(' ', '', regex=False))
         manifest['Re-analysis Specimen ID'] = \
             manifest['Re-analysis Specimen ID'].str.replace(
                 r'SP-|\.', '', regex=True)
@@ -546,30 +581,40 @@ def parse_manifest(contents, split_tests=False, subset=None) -> Tuple[pd.DataFra
 
         # sample id may be split between 'Specimen ID' and 'Instrument ID' or
         # Re-analysis Specimen ID and Re-analysis Instrument ID columns, join
-        # these as {InstrumentID-SpecimenID} to get a mapping of sample ID -> CI
-        manifest['SampleID'] = manifest['Instrument ID'] + \
-            '-' + manifest['Specimen ID']
-        manifest['ReanalysisID'] = manifest['Re-analysis Instrument ID'] + \
-            '-' + manifest['Re-analysis Specimen ID']
+        # these as {InstrumentID-SpecimenID} to get a mapping of sample ID -> CI,
+        # str.cat joins each pair in one pass without an intermediate column
+        manifest['SampleID'] = manifest['Instrument ID'].str.cat(
+            manifest['Specimen ID'], sep='-')
+        manifest['ReanalysisID'] = manifest['Re-analysis Instrument ID'].str.cat(
+            manifest['Re-analysis Specimen ID'], sep='-')
 
         manifest = manifest[['SampleID', 'ReanalysisID', 'Test Codes']]
 
         data = defaultdict(lambda: defaultdict(list))
 
-        for idx, row in manifest.iterrows():
+        # source is the same for every sample => share the one dict
+        sample_source = {'manifest_source': source}
+
+        # single pass over just the columns we need, iterrows() builds a
+        # whole Series per row which we then throw away
+        rows = zip(
+            manifest['SampleID'],
+            manifest['ReanalysisID'],
+            manifest['Test Codes']
+        )
+
+        for idx, (sample_id, reanalysis_id, tests) in enumerate(rows):
             # split test codes to list and sense check they're valid format
             # will be formatted as 'R211.1, , , ,' or 'HGNC:1234, , , ,' etc.
-            test_codes = [
-                x for x in row['Test Codes'].replace(' ', '').split(',') if x
-            ]
+            test_codes = [x for x in tests.split(',') if x]
 
             # preferentially use ReanalysisID if present
-            if re.match(r"[\d\w]+-[\d\w]+", row.ReanalysisID):
-                data[row.ReanalysisID]['tests'].append(test_codes)
-                manifest_source[row.ReanalysisID] = {'manifest_source': 'Epic'}
-            elif re.match(r"[\d\w]+-[\d\w]+", row.SampleID):
-                data[row.SampleID]['tests'].append(test_codes)
-                manifest_source[row.SampleID] = {'manifest_source': 'Epic'}
+            if re.match(r"[\d\w]+-[\d\w]+", reanalysis_id):
+                data[reanalysis_id]['tests'].append(test_codes)
+                manifest_source[reanalysis_id] = sample_source
+            elif re.match(r"[\d\w]+-[\d\w]+", sample_id):
+                data[sample_id]['tests'].append(test_codes)
+                manifest_source[sample_id] = sample_source
             elif subset:
                 # sampleID and reanalysisID don't seem valid, continue
                 # anyway if we're subsetting and assume that the user
@@ -579,14 +624,14 @@ def parse_manifest(contents, split_tests=False, subset=None) -> Tuple[pd.DataFra
                 print(
                     f"Row {idx + 1} of manifest does not seem to contain all "
                     "required identifiers, --subset specified so will skip "
-                    f"this row:\n\t{row.tolist()}"
+                    f"this row:\n\t{manifest.iloc[idx].tolist()}"
                 )
                 continue
             else:
                 # something funky with this sample naming
                 raise RuntimeError(
                     f"Error in sample formatting of row {idx + 1} in manifest:"
-                    f"\n\t{row}"
+                    f"\n\t{manifest.iloc[idx]}"
                 )
     else:
         # throw an error here as something is up with the file
@@ -601,13 +646,14 @@ def parse_manifest(contents, split_tests=False, subset=None) -> Tuple[pd.DataFra
         )
 
         # check that provided sample names are in our manifest
-        invalid = [x for x in subset if x not in data.keys()]
+        invalid = [x for x in subset if x not in data]
 
         if invalid:
             raise RuntimeError(
                 f'Sample names provided to -isubset not in manifest: {invalid}'
             )
 
+        subset = set(subset)
         data = {
             sample: tests for sample, tests in data.items()
             if sample in subset
@@ -673,8 +719,12 @@ def filter_manifest_samples_by_files(
     )
     file_prefixes = defaultdict(list)
 
+    # compile once and bind the match method to reuse for every file
+    # and sample below without repeated attribute lookups
+    match_pattern = re.compile(pattern).match
+
     for file in files:
-        match = re.match(pattern, file['describe']['name'])
+        match = match_pattern(file['describe']['name'])
         if match:
             file_prefixes[match.group()].append(file)
     print(
@@ -686,8 +736,8 @@ def filter_manifest_samples_by_files(
     manifest_no_files = []
     manifest_with_files = defaultdict(lambda: defaultdict(list))
 
-    for sample in manifest.keys():
-        match = re.match(pattern, sample)
+    for sample, sample_config in manifest.items():
+        match = match_pattern(sample)
         if not match:
             # sample ID doesn't match expected pattern
             print(
@@ -697,18 +747,19 @@ def filter_manifest_samples_by_files(
             manifest_no_match.append(sample)
         else:
             # we have prefix, try find matching files with same prefix
-            sample_files = file_prefixes.get(match.group())
+            prefix = match.group()
+            sample_files = file_prefixes.get(prefix)
             if not sample_files:
                 # found no files for this sample
                 print(
                     f"No files found for {sample} using pattern {pattern}, "
-                    f"prefix matched in samplename {match.group()}"
+                    f"prefix matched in samplename {prefix}"
                 )
                 manifest_no_files.append(sample)
             else:
                 # sample matches pattern and matches some file(s)
-                manifest_with_files[sample] = manifest[sample]
-                manifest_with_files[sample][name] = sample_files
+                sample_config[name] = sample_files
+                manifest_with_files[sample] = sample_config
 
     if manifest_no_match:
         print(
@@ -752,14 +803,15 @@ def check_manifest_valid_test_codes(manifest, genepanels) -> dict:
     invalid = defaultdict(list)
     valid = defaultdict(lambda: defaultdict(list))
 
-    genepanels_test_codes = sorted(set(genepanels['test_code'].tolist()))
+    # set for checking test codes against, sorted list for printing
+    genepanels_test_codes = set(genepanels['test_code'])
 
-    print(f"Current valid test codes:\n\t{genepanels_test_codes}")
+    print(f"Current valid test codes:\n\t{sorted(genepanels_test_codes)}")
 
     for sample, test_codes in manifest.items():
         sample_invalid_test = []
 
-        if [x for x in test_codes['tests'] if x] == []:
+        if not any(test_codes['tests']):
             # sample has no booked tests => chuck it in the error bucket
             invalid[sample].append('No tests booked for sample')
             continue
@@ -840,7 +892,7 @@ def split_manifest_tests(data) -> dict:
         for test_list in test_codes['tests']:
             test_genes = []
             for sub_test in test_list:
-                if re.match(r"[RC][\d]+\.[\d]+", sub_test):
+                if TEST_CODE_REGEX.match(sub_test):
                     # it's a panel => split it out
                     all_split_test_codes.append([sub_test])
                 else:
@@ -909,6 +961,15 @@ def add_panels_and_indications_to_manifest(manifest, genepanels) -> dict:
 
     manifest_with_panels = {}
 
+    # group genepanels rows by test code once so each test is a dict
+    # lookup instead of filtering the full dataframe for every test
+    genepanels_by_test = {
+        test_code: rows for test_code, rows in genepanels.groupby(
+            'test_code', sort=False
+        )
+    }
+    test_panels = {}
+
     for sample, values in manifest.items():
         sample_tests = {
             'tests': values['tests'],
@@ -919,7 +980,7 @@ def add_panels_and_indications_to_manifest(manifest, genepanels) -> dict:
             panels = []
             indications = []
             for test in test_list:
-                if re.fullmatch(r'[RC][\d]+\.[\d]+', test):
+                if TEST_CODE_REGEX.fullmatch(test):
                     # get genepanels row for current test prefix, should just
                     # be one since we dropped HGNC ID column and duplicates
 
@@ -937,37 +998,45 @@ def add_panels_and_indications_to_manifest(manifest, genepanels) -> dict:
                     # which would result in:
                     # R371.1 -> HGNC:10483_SG_panel_1.0.0;HGNC:1397_SG_panel_1.0.0;HGNC:28423_SG_panel_1.0.0
 
-                    genepanels_row = genepanels[genepanels['test_code'] == test]
+                    # panels and indication for a test code are the same
+                    # for every sample => only build these once per code
+                    if test not in test_panels:
+                        genepanels_row = genepanels_by_test.get(test)
 
-                    assert not genepanels_row.empty, (
-                        f"Filtering genepanels for {test} returned empty df"
-                    )
-
-                    if len(genepanels_row.index) > 1:
-                        # munge the panel strings together to handle the above
-                        print(
-                            f'Test code {test} has >1 panel name assigned, '
-                            f'these will be combined:\n\t{genepanels_row}'
-                        )
-                        panel_str = ';'.join(
-                            genepanels_row['panel_name'].tolist()
+                        assert genepanels_row is not None, (
+                            f"Filtering genepanels for {test} returned empty df"
                         )
 
-                        # try clean up the panel string and drop
-                        # duplicated _SG_panel_1.0.0
-                        if '_SG_panel_1.0.0' in panel_str:
-                            panel_str = (
-                                f"{re.sub(r'_SG_panel_1.0.0', '', panel_str)}"
-                                "_SG_panel_1.0.0"
+                        if len(genepanels_row.index) > 1:
+                            # munge the panel strings together to handle the above
+                            print(
+                                f'Test code {test} has >1 panel name assigned, '
+                                f'these will be combined:\n\t{genepanels_row}'
+                            )
+                            panel_str = ';'.join(
+                                genepanels_row['panel_name'].tolist()
                             )
-                    else:
-                        # this is nice and sane and 1:1
-                        panel_str = genepanels_row.iloc[0].panel_name
 
+                            # try clean up the panel string and drop
+                            # duplicated _SG_panel_1.0.0
+                            if '_SG_panel_1.0.0' in panel_str:
+                                panel_str = (
+                                    f"{re.sub(r'_SG_panel_1.0.0', '', panel_str)}"
+                                    "_SG_panel_1.0.0"
+                                )
+                        else:
+                            # this is nice and sane and 1:1
+                            panel_str = genepanels_row.iloc[0].panel_name
+
+                        test_panels[test] = (
+                            panel_str, genepanels_row.iloc[0].indication
+                        )
+
+                    panel_str, indication = test_panels[test]
                     panels.append(panel_str)
-                    indications.append(genepanels_row.iloc[0].indication)
+                    indications.append(indication)
 
-                elif re.fullmatch(r'_HGNC:[\d]+', test):
+                elif HGNC_ID_REGEX.fullmatch(test):
                     # add gene IDs as is to all lists
                     panels.append(test)
                     indications.append(test)
@@ -1017,15 +1086,27 @@ def check_exclude_samples(samples, exclude, mode, single_dir=None) -> dict:
     RuntimeError
         Raised when one or more exclude_samples not present in sample list
     """
-    print("Checking provided exclude sample names are valid...")
-    print(f"Samples specified to exclude:\n{prettier_print(exclude)}")
+    print(
+        "Checking provided exclude sample names are valid...\n"
+        "Samples specified to exclude:"
+    )
+    prettier_print(exclude)
+
+    # check that provided exclude names/patterns match to at least one,
+    # skipping the control pattern before scanning any samples, names that
+    # are exact sample names are found with a set lookup and only others
+    # are scanned for as a pattern, stopping at the first sample matched
+    sample_names = set(samples)
+    exclude_not_present = []
+
+    for name in exclude:
+        if name == epic_control_pattern or name in sample_names:
+            continue
 
-    # check that provided exclude names/patterns match to at least one
-    exclude_not_present = [
-        name for name in exclude
-        if not any([re.match(name, sample) for sample in samples])
-        and not name == r'^\w+-\w+Q\w+-'
-    ]
+        # compile once per name instead of on every sample checked
+        match_name = re.compile(name).match
+        if not any(match_name(sample) for sample in samples):
+            exclude_not_present.append(name)
 
     if exclude_not_present:
         if mode == 'reports' and single_dir:
@@ -1038,7 +1119,7 @@ def check_exclude_samples(samples, exclude, mode, single_dir=None) -> dict:
                 f"output directory ({single_dir}) for BAM files to be able "
                 "to exclude"
             )
-            sample_with_bam = []
+            sample_without_bam = []
 
             # ensure if single dir being specified with a project we use it
             project = None
@@ -1056,17 +1137,16 @@ def check_exclude_samples(samples, exclude, mode, single_dir=None) -> dict:
                     project=project,
                     folder=single_dir,
                     limit=1,
-                    describe=True
+                    describe={'fields': {'name': True}}
                 ))
 
                 if bam:
                     print(f"Found bam file: {bam[0]['describe']['name']}")
-                    sample_with_bam.append(sample)
                 else:
                     print(f"No bam file found for {sample}")
+                    sample_without_bam.append(sample)
 
-            exclude_not_present = list(
-                set(exclude_not_present) - set(sample_with_bam))
+            exclude_not_present = sample_without_bam
 
             if not exclude_not_present:
                 print(
@@ -1121,15 +1201,17 @@ def add_dynamic_inputs(config, **kwargs) -> dict:
 
     for field, config_value in config.items():
         if isinstance(config_value, str):
-            if kwargs.get(config_value.replace('INPUT-', '')):
-                config_value = kwargs.get(config_value.replace('INPUT-', ''))
+            # strip the prefix and get the replacement once per field
+            value = kwargs.get(config_value.replace('INPUT-', ''))
+            if value:
+                config_value = value
 
         filled_config[field] = config_value
 
     # sense check we removed all placeholders
-    assert not any([
-        x.startswith('INPUT-') if isinstance(x, str) else False
+    assert not any(
+        isinstance(x, str) and x.startswith('INPUT-')
         for x in filled_config.values()
-    ]), "INPUT- placeholders left in config"
+    ), "INPUT- placeholders left in config"
 
     return filled_config